@@ -0,0 +1,93 @@
+import argparse
+from datetime import datetime
+
+from utils.debug_color import debug_print
+from utils.results_query import AGGREGATES, ResultsQuery
+from utils.results_store import CONSULTATIONS, DEFAULT_STORE_DIR, SECTEURS, date_to_days
+
+GROUP_COLUMNS = ("code_postal", "secteur", "consultation", "specialite", "date_crawl")
+
+
+def parse_date(date_text):
+    """Convertit une date JJ/MM/AAAA en jours depuis le 01/01/1970."""
+    try:
+        return date_to_days(datetime.strptime(date_text, "%d/%m/%Y").date())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide '{date_text}' (format attendu : JJ/MM/AAAA)")
+
+
+def parse_arguments():
+    """Parse et retourne les arguments de ligne de commande."""
+    parser = argparse.ArgumentParser(description="Interroge le store des résultats de crawl Doctolib.")
+    parser.add_argument("--store_dir", type=str, default=DEFAULT_STORE_DIR, help="Répertoire du store de résultats.")
+    parser.add_argument("--specialite", type=str, help="Spécialité recherchée lors du crawl (ex: dermatologue).")
+    parser.add_argument("--insurance", type=str, nargs="+", choices=SECTEURS, help="Secteur(s) d'assurance.")
+    parser.add_argument("--consultation_type", type=str, choices=CONSULTATIONS, help="Type de consultation.")
+    parser.add_argument("--code_postal", type=int, nargs="+", help="Code(s) postal(aux) (ex: 75015 75016).")
+    parser.add_argument("--start_date", type=parse_date, help="Date de crawl minimale (JJ/MM/AAAA).")
+    parser.add_argument("--end_date", type=parse_date, help="Date de crawl maximale (JJ/MM/AAAA).")
+    parser.add_argument("--colonne", type=str, choices=["prix_min", "prix_max"], default="prix_min", help="Colonne de prix agrégée.")
+    parser.add_argument("--agregat", type=str, choices=AGGREGATES, default="median", help="Fonction d'agrégation.")
+    parser.add_argument("--par", type=str, choices=GROUP_COLUMNS, help="Colonne de regroupement (ex: code_postal).")
+    parser.add_argument("--lister", type=int, default=0, help="Nombre de praticiens correspondants à afficher.")
+
+    args = parser.parse_args()
+    debug_print(f"Paramètres reçus : {args}", level="debug")
+    return args
+
+
+def format_group_key(query, column, key):
+    """Rend lisible une clé de regroupement codée."""
+    if column == "secteur":
+        return SECTEURS[key]
+    if column == "consultation":
+        return CONSULTATIONS[key]
+    if column == "specialite":
+        return query.meta["specialites"][key]
+    if column == "date_crawl":
+        return datetime.fromordinal(key + datetime(1970, 1, 1).toordinal()).strftime("%d/%m/%Y")
+    if column == "code_postal":
+        return f"{key:05d}"
+    return str(key)
+
+
+def main():
+    """Fonction principale du script."""
+    args = parse_arguments()
+    query = ResultsQuery(args.store_dir)
+    debug_print(f"{query.n_rows} ligne(s) dans le store '{args.store_dir}'.", level="info")
+
+    specialite = None
+    if args.specialite:
+        specialites = query.meta["specialites"]
+        wanted = args.specialite.strip().lower()
+        if wanted not in specialites:
+            debug_print(f"Spécialité '{args.specialite}' absente du store (connues : {', '.join(specialites)}).", level="warning")
+            return
+        specialite = [specialites.index(wanted)]
+
+    rows = query.filter(
+        code_postal=args.code_postal,
+        secteur=[SECTEURS.index(s) for s in args.insurance] if args.insurance else None,
+        consultation=[CONSULTATIONS.index(args.consultation_type)] if args.consultation_type else None,
+        specialite=specialite,
+        date_debut=args.start_date,
+        date_fin=args.end_date,
+    )
+    debug_print(f"{len(rows)} ligne(s) correspondent aux filtres.", level="success")
+
+    results = query.aggregate(rows, colonne=args.colonne, fonction=args.agregat, par=args.par)
+    if not results:
+        debug_print("Aucune valeur à agréger.", level="warning")
+    for key, value, count in results:
+        label = format_group_key(query, args.par, key) if args.par else "total"
+        print(f"{label:<20} {args.agregat}({args.colonne}) = {value:.2f}  (n={count})")
+
+    if args.lister:
+        print("-" * 50)
+        for nom, lien, ville in query.texts(rows[:args.lister]):
+            print(f"{nom} ({ville}) : {lien}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from utils.debug_color import debug_print
+from utils.results_store import DEFAULT_STORE_DIR, ResultsStore
 
 BASE_URL = "https://www.doctolib.fr"
 CSV_HEADERS = [
@@ -53,6 +54,7 @@ def parse_arguments():
     parser.add_argument("--min_price", type=int, help="Plage de prix minimum (en €).")
     parser.add_argument("--max_price", type=int, help="Plage de prix maximum (en €).")
     parser.add_argument("location", type=str, help="Mot-clé libre pour l'adresse (ex: 75015).")
+    parser.add_argument("--store_dir", type=str, default=DEFAULT_STORE_DIR, help="Répertoire du store de résultats cumulés (interrogeable avec query_results.py).")
     
     args = parser.parse_args()
     debug_print(f"Paramètres reçus : {args}", level="debug")
@@ -441,7 +443,7 @@ def should_filter_card(data, args, card_index):
     return False
 
 def process_search_results(driver, args):
-    """Traite les résultats de recherche et écrit les données dans un CSV."""
+    """Traite les résultats de recherche et écrit les données dans un CSV et dans le store de résultats."""
     output_filename = "doctolib.csv"
     
     initial_practitioner_card_elements = find_practitioner_cards(driver)
@@ -456,7 +458,7 @@ def process_search_results(driver, args):
     # Utilise un timeout raisonnable.
     wait_for_results_page_reload = WebDriverWait(driver, 1)
 
-    with open(output_filename, 'w', newline='', encoding='utf-8') as csvfile:
+    with open(output_filename, 'w', newline='', encoding='utf-8') as csvfile, ResultsStore(args.store_dir) as store:
         writer = csv.DictWriter(csvfile, fieldnames=CSV_HEADERS)
         writer.writeheader()
         debug_print(f"Fichier CSV '{output_filename}' initialisé avec les en-têtes.", level="success")
@@ -497,6 +499,7 @@ def process_search_results(driver, args):
             
             # Écrire dans le CSV
             writer.writerow(data)
+            store.append_row(data, args.query)
             cards_written_to_csv += 1
             debug_print(f"Données de la carte {i+1} écrites dans le CSV: {data['Nom complet']}", level="success")
     
@@ -504,6 +507,7 @@ def process_search_results(driver, args):
         debug_print("Aucun résultat écrit dans CSV après vérif N/A et filtres (cartes trouvées initialement).", level="warning")
     elif cards_written_to_csv > 0:
         debug_print(f"{cards_written_to_csv} praticien(s) écrit(s) dans '{output_filename}'.", level="success")
+        debug_print(f"Store '{args.store_dir}' : {len(store)} ligne(s) cumulée(s).", level="info")
     
     return cards_written_to_csv
 
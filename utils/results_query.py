@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+
+from utils.results_store import (
+    STORAGE_COLUMNS, TEXT_END_COLUMN, TEXT_FILENAME, column_path, count_rows, load_meta,
+)
+
+# Colonnes disposant d'un index trié persistant
+INDEXED_COLUMNS = ("code_postal", "secteur", "consultation", "date_crawl")
+AGGREGATES = ("count", "mean", "median", "min", "max")
+
+
+class ResultsQuery:
+    """Lecture vectorisée (NumPy) d'un store écrit par ResultsStore.
+
+    Les colonnes sont ouvertes en memmap : rien n'est chargé sous forme de
+    dictionnaires Python, seules les pages touchées par un filtre sont lues.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.meta = load_meta(store_dir)
+        self.n_rows = count_rows(store_dir)
+        self.columns = {column: self._open_column(column, dtype) for column, (_, dtype) in STORAGE_COLUMNS.items()}
+        self._indexes = {}
+
+    def _open_column(self, column, dtype):
+        if self.n_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(column_path(self.store_dir, column), dtype=dtype, mode="r", shape=(self.n_rows,))
+
+    def index(self, column):
+        """Retourne (clés triées, positions) pour une colonne indexée.
+
+        L'index est persisté dans '<colonne>.idx.npz' et reconstruit dès que le
+        nombre de lignes du store a changé.
+        """
+        if column in self._indexes:
+            return self._indexes[column]
+        index_path = os.path.join(self.store_dir, f"{column}.idx.npz")
+        if os.path.exists(index_path):
+            with np.load(index_path) as saved:
+                if saved["keys"].shape[0] == self.n_rows:
+                    self._indexes[column] = (saved["keys"], saved["order"])
+                    return self._indexes[column]
+        order = np.argsort(self.columns[column], kind="stable").astype(np.int64)
+        keys = np.asarray(self.columns[column])[order]
+        if self.n_rows:
+            np.savez(index_path, keys=keys, order=order)
+        self._indexes[column] = (keys, order)
+        return self._indexes[column]
+
+    def _ranges(self, column, values=None, low=None, high=None):
+        """Bornes (débuts, fins) dans l'index des lignes dont la colonne vaut l'une des valeurs ou est dans [low, high]."""
+        keys, _ = self.index(column)
+        if values is not None:
+            values = np.unique(np.asarray(values, dtype=keys.dtype))
+            return np.searchsorted(keys, values, side="left"), np.searchsorted(keys, values, side="right")
+        start = 0 if low is None else np.searchsorted(keys, low, side="left")
+        end = len(keys) if high is None else np.searchsorted(keys, high, side="right")
+        return np.array([start]), np.array([end])
+
+    def _positions(self, column, starts, ends):
+        """Positions des lignes couvertes par les bornes données dans l'index."""
+        _, order = self.index(column)
+        return np.concatenate([order[start:end] for start, end in zip(starts, ends)] or [order[:0]])
+
+    def filter(self, code_postal=None, secteur=None, consultation=None, specialite=None,
+               date_debut=None, date_fin=None):
+        """Retourne les positions (triées) des lignes satisfaisant tous les critères.
+
+        code_postal, secteur, consultation et specialite acceptent une liste de
+        codes ; date_debut et date_fin sont en jours depuis le 01/01/1970.
+        Le critère indexé le plus sélectif fournit les candidats, les autres
+        sont appliqués par masque vectorisé sur ces seuls candidats.
+        """
+        conditions = []  # (colonne, valeurs, bas, haut)
+        if code_postal is not None:
+            conditions.append(("code_postal", code_postal, None, None))
+        if secteur is not None:
+            conditions.append(("secteur", secteur, None, None))
+        if consultation is not None:
+            conditions.append(("consultation", consultation, None, None))
+        if date_debut is not None or date_fin is not None:
+            conditions.append(("date_crawl", None, date_debut, date_fin))
+
+        if conditions:
+            # Seules les bornes sont calculées pour classer les critères par sélectivité
+            ranges = [self._ranges(column, values, low, high) for column, values, low, high in conditions]
+            best = int(np.argmin([int(np.sum(ends - starts)) for starts, ends in ranges]))
+            rows = np.sort(self._positions(conditions[best][0], *ranges[best]))
+            del conditions[best]
+        else:
+            rows = np.arange(self.n_rows, dtype=np.int64)
+
+        if specialite is not None:
+            conditions.append(("specialite", specialite, None, None))
+
+        for column, values, low, high in conditions:
+            if not len(rows):
+                break
+            column_values = self.columns[column][rows]
+            if values is not None:
+                mask = np.isin(column_values, values)
+            else:
+                mask = np.ones(len(rows), dtype=bool)
+                if low is not None:
+                    mask &= column_values >= low
+                if high is not None:
+                    mask &= column_values <= high
+            rows = rows[mask]
+        return rows
+
+    def aggregate(self, rows, colonne="prix_min", fonction="median", par=None):
+        """Agrège une colonne numérique sur les lignes données, éventuellement par groupe.
+
+        Retourne une liste de (clé de groupe ou None, valeur, effectif). Les
+        valeurs manquantes (NaN) sont ignorées, sauf par 'count' qui compte toutes les lignes.
+        """
+        if fonction not in AGGREGATES:
+            raise ValueError(f"Agrégat inconnu : {fonction}")
+        values = np.asarray(self.columns[colonne][rows], dtype=np.float64)
+        keys = np.asarray(self.columns[par][rows]) if par else np.zeros(len(rows), dtype=np.int8)
+        if fonction != "count":
+            present = ~np.isnan(values)
+            values, keys = values[present], keys[present]
+        if not len(values):
+            return []
+
+        # Tri par (groupe, valeur) : chaque groupe devient un segment contigu et trié
+        order = np.lexsort((values, keys))
+        values, keys = values[order], keys[order]
+        group_keys, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+
+        if fonction == "count":
+            results = counts.astype(np.float64)
+        elif fonction == "mean":
+            results = np.add.reduceat(values, starts) / counts
+        elif fonction == "min":
+            results = values[starts]
+        elif fonction == "max":
+            results = values[starts + counts - 1]
+        else:
+            results = (values[starts + (counts - 1) // 2] + values[starts + counts // 2]) / 2
+
+        group_keys = group_keys.tolist() if par else [None] * len(group_keys)
+        return list(zip(group_keys, results.tolist(), counts.tolist()))
+
+    def texts(self, rows):
+        """Retourne (nom, lien, ville) pour les lignes données, lues par seek dans le TSV."""
+        text_path = os.path.join(self.store_dir, TEXT_FILENAME)
+        if not len(rows) or not os.path.exists(text_path):
+            return []
+        text_ends = self.columns[TEXT_END_COLUMN]
+        results = []
+        with open(text_path, "rb") as f:
+            for row in rows:
+                start = int(text_ends[row - 1]) if row > 0 else 0
+                f.seek(start)
+                line = f.read(int(text_ends[row]) - start).decode("utf-8")
+                results.append(tuple(line.rstrip("\n").split("\t")))
+        return results
@@ -0,0 +1,254 @@
+import array
+import json
+import os
+import re
+import sys
+from datetime import date
+
+# Colonnes typées du store : nom -> (typecode array.array, dtype NumPy équivalent)
+COLUMNS = {
+    "code_postal": ("i", "<i4"),
+    "secteur": ("b", "<i1"),
+    "consultation": ("b", "<i1"),
+    "specialite": ("h", "<i2"),
+    "date_crawl": ("i", "<i4"),  # Jours depuis le 01/01/1970
+    "prix_min": ("f", "<f4"),
+    "prix_max": ("f", "<f4"),
+}
+
+# Fin (exclue, en octets) de la ligne de chaque enregistrement dans le TSV :
+# permet de relire un praticien par seek et d'aligner le TSV après une interruption
+TEXT_END_COLUMN = "fin_texte"
+STORAGE_COLUMNS = {**COLUMNS, TEXT_END_COLUMN: ("q", "<i8")}
+
+# Vocabulaires des colonnes catégorielles (le code stocké est l'indice dans le tuple)
+SECTEURS = ("N/A", "secteur 1", "secteur 2", "non conventionné", "conventionné")
+CONSULTATIONS = ("sur place", "visio")
+
+DEFAULT_STORE_DIR = "results_store"
+TEXT_FILENAME = "praticiens.tsv"
+META_FILENAME = "meta.json"
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_FEE_ITEM_RE = re.compile(
+    r"([^:,]+):\s*(\d+(?:[.,]\d+)?)\s*€(?:\s*à\s*(\d+(?:[.,]\d+)?)\s*€)?"
+)
+
+
+def column_path(store_dir, column):
+    """Retourne le chemin du fichier binaire d'une colonne."""
+    return os.path.join(store_dir, f"{column}.bin")
+
+
+def parse_fee(price_text):
+    """Extrait (prix_min, prix_max) de la consultation depuis le champ 'Prix estimé'.
+
+    Seuls les tarifs dont l'intitulé commence par 'Consultation' sont retenus ;
+    sinon (actes, tarifs non renseignés...) les deux valeurs sont NaN.
+    """
+    for match in _FEE_ITEM_RE.finditer(price_text or ""):
+        if not match.group(1).strip().lower().startswith("consultation"):
+            continue
+        fee_min = float(match.group(2).replace(",", "."))
+        fee_max = float(match.group(3).replace(",", ".")) if match.group(3) else fee_min
+        return fee_min, fee_max
+    return float("nan"), float("nan")
+
+
+def parse_postal_code(postal_code_text):
+    """Convertit le code postal en entier (0 si absent ou invalide)."""
+    postal_code_text = (postal_code_text or "").strip()
+    return int(postal_code_text) if postal_code_text.isdigit() else 0
+
+
+def parse_sector(sector_text):
+    """Retourne le code du secteur d'assurance (indice dans SECTEURS)."""
+    sector_text = (sector_text or "").lower()
+    if "non conventionné" in sector_text:
+        return SECTEURS.index("non conventionné")
+    # Le droit permanent à dépassement est assimilé au secteur 2
+    if "secteur 2" in sector_text or "dépassement" in sector_text:
+        return SECTEURS.index("secteur 2")
+    if "secteur 1" in sector_text:
+        return SECTEURS.index("secteur 1")
+    if "conventionné" in sector_text:
+        return SECTEURS.index("conventionné")
+    return SECTEURS.index("N/A")
+
+
+def parse_consultation(consultation_text):
+    """Retourne le code du type de consultation (indice dans CONSULTATIONS)."""
+    return CONSULTATIONS.index("visio") if (consultation_text or "").strip().lower() == "visio" else CONSULTATIONS.index("sur place")
+
+
+def date_to_days(day):
+    """Convertit une date en nombre de jours depuis le 01/01/1970."""
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+class ResultRecord:
+    """Enregistrement compact et typé d'un praticien extrait."""
+
+    __slots__ = ("nom", "lien", "ville", "code_postal", "secteur", "consultation",
+                 "specialite", "date_crawl", "prix_min", "prix_max")
+
+    def __init__(self, nom, lien, ville, code_postal, secteur, consultation,
+                 specialite, date_crawl, prix_min, prix_max):
+        self.nom = nom
+        self.lien = lien
+        self.ville = ville
+        self.code_postal = code_postal
+        self.secteur = secteur
+        self.consultation = consultation
+        self.specialite = specialite
+        self.date_crawl = date_crawl
+        self.prix_min = prix_min
+        self.prix_max = prix_max
+
+    @classmethod
+    def from_row(cls, data, specialite_code, crawl_date):
+        """Construit un enregistrement depuis une ligne au format CSV_HEADERS."""
+        prix_min, prix_max = parse_fee(data.get("Prix estimé"))
+        return cls(
+            nom=data.get("Nom complet", "N/A"),
+            lien=data.get("Lien Profil", "N/A"),
+            ville=data.get("Ville", "N/A"),
+            code_postal=parse_postal_code(data.get("Code postal")),
+            secteur=parse_sector(data.get("Secteur d'assurance")),
+            consultation=parse_consultation(data.get("Type de consultation")),
+            specialite=specialite_code,
+            date_crawl=date_to_days(crawl_date),
+            prix_min=prix_min,
+            prix_max=prix_max,
+        )
+
+
+def load_meta(store_dir):
+    """Charge les métadonnées du store (vocabulaire des spécialités)."""
+    meta_path = os.path.join(store_dir, META_FILENAME)
+    if not os.path.exists(meta_path):
+        return {"version": 1, "specialites": []}
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_text_end(store_dir, row):
+    """Lit la fin (en octets) de la ligne TSV d'un enregistrement (0 pour row < 0)."""
+    if row < 0:
+        return 0
+    values = array.array(STORAGE_COLUMNS[TEXT_END_COLUMN][0])
+    with open(column_path(store_dir, TEXT_END_COLUMN), "rb") as f:
+        f.seek(row * values.itemsize)
+        values.fromfile(f, 1)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values[0]
+
+
+def count_rows(store_dir):
+    """Nombre de lignes complètes présentes sur disque.
+
+    La plus courte colonne fait foi ; les lignes dont le texte dépasse la
+    taille du TSV sont également écartées.
+    """
+    counts = []
+    for column, (typecode, _) in STORAGE_COLUMNS.items():
+        path = column_path(store_dir, column)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        counts.append(size // array.array(typecode).itemsize)
+    rows = min(counts)
+    text_path = os.path.join(store_dir, TEXT_FILENAME)
+    text_size = os.path.getsize(text_path) if os.path.exists(text_path) else 0
+    while rows and read_text_end(store_dir, rows - 1) > text_size:
+        rows -= 1
+    return rows
+
+
+class ResultsStore:
+    """Store en colonnes des résultats de crawl, alimenté ligne par ligne.
+
+    Les colonnes numériques sont accumulées dans des array.array puis ajoutées
+    aux fichiers binaires du répertoire lors de flush(). Les champs texte (nom,
+    lien, ville) sont écrits dans un fichier TSV aligné sur les mêmes lignes.
+    """
+
+    def __init__(self, store_dir, crawl_date=None):
+        self.store_dir = store_dir
+        self.crawl_date = crawl_date or date.today()
+        os.makedirs(store_dir, exist_ok=True)
+        self.meta = load_meta(store_dir)
+        self._rows_on_disk = count_rows(store_dir)
+        self._text_end = read_text_end(store_dir, self._rows_on_disk - 1)
+        self._truncate_files()
+        self._columns = {column: array.array(typecode) for column, (typecode, _) in STORAGE_COLUMNS.items()}
+        self._texts = []
+
+    def __len__(self):
+        return self._rows_on_disk + len(self._texts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def _truncate_files(self):
+        """Aligne colonnes et TSV sur les lignes complètes (écriture interrompue lors d'un run précédent)."""
+        expected_sizes = {
+            column_path(self.store_dir, column): self._rows_on_disk * array.array(typecode).itemsize
+            for column, (typecode, _) in STORAGE_COLUMNS.items()
+        }
+        expected_sizes[os.path.join(self.store_dir, TEXT_FILENAME)] = self._text_end
+        for path, expected_size in expected_sizes.items():
+            if os.path.exists(path) and os.path.getsize(path) > expected_size:
+                with open(path, "r+b") as f:
+                    f.truncate(expected_size)
+
+    def specialite_code(self, specialite):
+        """Retourne le code d'une spécialité, en l'ajoutant au vocabulaire si besoin."""
+        specialite = specialite.strip().lower()
+        specialites = self.meta["specialites"]
+        if specialite not in specialites:
+            specialites.append(specialite)
+        return specialites.index(specialite)
+
+    def append(self, record):
+        """Ajoute un ResultRecord au tampon."""
+        for column in COLUMNS:
+            self._columns[column].append(getattr(record, column))
+        fields = (record.nom, record.lien, record.ville)
+        line = "\t".join(re.sub(r"[\t\r\n]", " ", field) for field in fields) + "\n"
+        self._texts.append(line.encode("utf-8"))
+        self._text_end += len(self._texts[-1])
+        self._columns[TEXT_END_COLUMN].append(self._text_end)
+
+    def append_row(self, data, specialite):
+        """Ajoute une ligne au format CSV_HEADERS pour la spécialité recherchée."""
+        record = ResultRecord.from_row(data, self.specialite_code(specialite), self.crawl_date)
+        self.append(record)
+        return record
+
+    def flush(self):
+        """Écrit les lignes en attente sur disque.
+
+        Ordre d'écriture : meta.json, puis le TSV, puis les colonnes. Les
+        colonnes servent de point de validation : une ligne n'existe que si
+        toutes ses colonnes ont été écrites, et le surplus éventuel (TSV ou
+        colonnes partielles) est tronqué à la réouverture du store.
+        """
+        if not self._texts:
+            return
+        meta_path = os.path.join(self.store_dir, META_FILENAME)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(meta_path + ".tmp", meta_path)
+        with open(os.path.join(self.store_dir, TEXT_FILENAME), "ab") as f:
+            f.write(b"".join(self._texts))
+        for column, values in self._columns.items():
+            if sys.byteorder == "big":
+                values.byteswap()  # Le format sur disque est little-endian
+            with open(column_path(self.store_dir, column), "ab") as f:
+                values.tofile(f)
+            del values[:]
+        self._rows_on_disk += len(self._texts)
+        self._texts = []